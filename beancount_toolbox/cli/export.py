@@ -1,4 +1,5 @@
 import argparse
+import functools
 import importlib
 import os
 import re
@@ -15,6 +16,43 @@ from beancount.ops import compress
 import pydantic
 
 
+@functools.lru_cache(maxsize=None)
+def _plugin_fn(module_name: str, string_config: str | None):
+    """Build the function applying every plugin of a beancount module.
+
+    Cached on the configuration values, so a changed or copied config never
+    gets the function of another one.
+    """
+    module = importlib.import_module(module_name)
+    if not hasattr(module, '__plugins__'):
+        return []
+
+    cb_fns = [
+        getattr(module, fn) if isinstance(fn, str) else fn
+        for fn in module.__plugins__
+    ]
+
+    def wrapper(entires, options_map):
+        errors = []
+        for cb in cb_fns:
+            if string_config is None:
+                new_entires, e = cb(
+                    entires,
+                    options_map,
+                )
+            else:
+                new_entires, e = cb(
+                    entires,
+                    options_map,
+                    string_config,
+                )
+            new_entires = data.sorted(new_entires)
+            errors.extend(e)
+        return new_entires, errors
+
+    return wrapper
+
+
 class BeancountPluginConfig(pydantic.BaseModel):
     module_name: str = pydantic.Field(
         description=
@@ -29,35 +67,7 @@ class BeancountPluginConfig(pydantic.BaseModel):
         self
     ) -> Callable[[typing.List[typing.NamedTuple], typing.Mapping],
                   typing.Tuple[typing.List[typing.NamedTuple], typing.List]]:
-
-        module = importlib.import_module(self.module_name)
-        if not hasattr(module, '__plugins__'):
-            return []
-
-        cb_fns = [
-            getattr(module, fn) if isinstance(fn, str) else fn
-            for fn in module.__plugins__
-        ]
-
-        def wrapper(entires, options_map):
-            errors = []
-            for cb in cb_fns:
-                if self.string_config is None:
-                    new_entires, e = cb(
-                        entires,
-                        options_map,
-                    )
-                else:
-                    new_entires, e = cb(
-                        entires,
-                        options_map,
-                        self.string_config,
-                    )
-                new_entires = data.sorted(new_entires)
-                errors.extend(e)
-            return new_entires, errors
-
-        return wrapper
+        return _plugin_fn(self.module_name, self.string_config)
 
     def apply(
         self, entries, options_map: typing.Mapping
@@ -103,23 +113,30 @@ def _pop_default(s):
     s.pop('default')
 
 
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str) -> re.Pattern:
+    """Compile the pattern of a rename action once per pattern string."""
+    return re.compile(pattern.strip())
+
+
 class RenameAccount(pydantic.BaseModel):
     old: str
     new: str
 
+    @property
+    def _pattern(self) -> re.Pattern:
+        return _compile(self.old)
+
     def _apply(
             self, entries
     ) -> typing.Tuple[typing.List[typing.NamedTuple], typing.List]:
-        old, new = self.old, self.new
+        search, new = self._pattern.search, self.new
         new_entries = []
         for entry in entries:
             if isinstance(entry, data.Transaction):
                 new_postings = []
                 for posting in entry.postings:
-                    g = re.search(
-                        old.strip(),
-                        posting.account,
-                    )
+                    g = search(posting.account)
                     if g:
                         new_postings.append(
                             posting._replace(account=new.format(
@@ -136,16 +153,20 @@ class RenameCommodity(pydantic.BaseModel):
     old: str
     new: str
 
+    @property
+    def _pattern(self) -> re.Pattern:
+        return _compile(self.old)
+
     def _apply(
             self, entries
     ) -> typing.Tuple[typing.List[typing.NamedTuple], typing.List]:
-        old, new = self.old, self.new
+        search, new = self._pattern.search, self.new
 
         def search_and_replace_amount(
                 units: data.Amount | None) -> data.Amount:
             if units is None:
                 return
-            g = re.search(old.strip(), units.currency)
+            g = search(units.currency)
             if g:
                 return data.Amount(
                     number=units.number,
@@ -158,7 +179,7 @@ class RenameCommodity(pydantic.BaseModel):
         ) -> typing.Union[data.Cost, data.CostSpec]:
             if cost is None:
                 return
-            g = re.search(old.strip(), cost.currency)
+            g = search(cost.currency)
             if g:
                 return cost._replace(currency=new.format(**g.groupdict()))
             return cost
@@ -259,19 +280,65 @@ class RootConfig(pydantic.BaseModel):
         return new_entries, new_errors
 
 
+def _load_config(stream: str | typing.TextIO) -> RootConfig | None:
+    try:
+        return RootConfig(**yaml.safe_load(stream))
+    except TypeError:
+        return None
+
+
+def _export(config: RootConfig, entries, errors, options_map: typing.Mapping,
+            file: typing.TextIO) -> int:
+    if len(errors) > 0:
+        printer.print_errors(errors, file=sys.stderr)
+        return 1
+
+    entries, errors = config.apply(entries, options_map)
+    if len(errors) > 0:
+        printer.print_errors(errors, file=sys.stderr)
+        return 1
+
+    printer.print_entries(entries, file=file)
+    return 0
+
+
+def run(config_text: str, ledger_text: str, file: typing.TextIO) -> int:
+    """Export a ledger according to an export definition.
+
+    Args:
+      config_text: The export definition as YAML.
+      ledger_text: The ledger to export in beancount syntax.
+      file: Stream to print the exported ledger to.
+    Returns:
+      0 on success, otherwise the exit code main() would have returned.
+    """
+    config = _load_config(config_text)
+    if config is None:
+        print("config file is invalid", file=sys.stderr)
+        return 2
+
+    return _export(config, *loader.load_string(ledger_text), file)
+
+
 @misc_utils.deprecated("export cli is going to be removed in version 2.0.0")
-def main():
+def main(argv: typing.List[str] = None, file: typing.TextIO = None):
+    """Export a beanfile according to an export definition.
+
+    Args:
+      argv: Command line arguments, defaults to sys.argv.
+      file: Stream to print the exported beanfile to. It overrides --output,
+        which is then left untouched.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument(
         '--output',
         '-o',
-        type=argparse.FileType('w'),
         default='-',
         help='Exported beanfile (prints output to stdout when undefined)',
     )
     parser.add_argument('config', help='Path to an export definition')
     parser.add_argument('beanfile', type=str, help='Path to a source file')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not os.path.isfile(args.config):
         print("no such config file", file=sys.stderr)
@@ -279,25 +346,20 @@ def main():
         return
 
     with open(args.config, 'r') as stream:
-        try:
-            config = RootConfig(**yaml.safe_load(stream))
-        except TypeError:
-            print("config file is invalid", file=sys.stderr)
-            sys.exit(2)
-
-    entries, errors, options_map = loader.load_file(args.beanfile)
-    if len(errors) > 0:
-        printer.print_errors(errors, file=sys.stderr)
-        sys.exit(1)
-        return
+        config = _load_config(stream)
+    if config is None:
+        print("config file is invalid", file=sys.stderr)
+        sys.exit(2)
 
-    entries, errors = config.apply(entries, options_map)
-    if len(errors) > 0:
-        printer.print_errors(errors, file=sys.stderr)
-        sys.exit(1)
-        return
+    if file is None:
+        try:
+            file = argparse.FileType('w')(args.output)
+        except argparse.ArgumentTypeError as e:
+            parser.error(f'argument --output/-o: {e}')
 
-    printer.print_entries(entries, file=args.output)
+    exit_code = _export(config, *loader.load_file(args.beanfile), file)
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,7 @@
 import io
 import datetime
+import functools
+import html
 import logging
 from bottle import response, request
 from beancount.utils import date_utils
@@ -8,6 +10,13 @@ from beancount.utils import misc_utils
 from beancount.web import web, views
 
 
+@functools.lru_cache(maxsize=256)
+def _quarter_span(year, quarter):
+    """Return the first day of a quarter and the first day after it."""
+    return (datetime.date(year, quarter * 3 - 2, 1),
+            date_utils.next_month(datetime.date(year, quarter * 3, 1)))
+
+
 class _QuarterView(views.View):
     """A view of the entries for a single month."""
 
@@ -23,9 +32,7 @@ class _QuarterView(views.View):
         """
         self.year = year
         self.quarter = quarter
-        self.start_date = datetime.date(year, quarter * 3 - 2, 1)
-        self.end_date = date_utils.next_month(
-            datetime.date(year, quarter * 3, 1))
+        self.start_date, self.end_date = _quarter_span(year, quarter)
 
         title = f'{self.start_date:%Y}-Q{quarter}'
 
@@ -41,28 +48,65 @@ class _QuarterView(views.View):
         return entries, index, self.end_date
 
 
-@web.app.route(
-    r'/x/view/year/<year:re:\d\d\d\d>/quarter/<quarter:re:\d>/<path:re:.*>',
-    name='quarter')
+def _int_filter(conf):
+    """A bottle route filter matching the regexp conf as an integer."""
+    return conf, int, str
+
+
+web.app.router.add_filter('int_re', _int_filter)
+
+
+@web.app.route(r'/x/view/year/<year:int_re:\d\d\d\d>'
+               r'/quarter/<quarter:int_re:[1-4]>/<path:re:.*>',
+               name='quarter')
 @web.handle_view(6)
 def _quarter(year=None, quarter=None, path=None):
-    year = int(year)
-    quarter = int(quarter)
-
+    # handle_view() caches the view per URL prefix in web.app.views and
+    # clears that cache when the ledger is reloaded, so the clamp in
+    # _QuarterView.apply_filter runs once per quarter and ledger version.
     return _QuarterView(web.app.entries, web.app.options, year, quarter)
 
 
-APP_NAVIGATION_QUARTER_FULL = web.bottle.SimpleTemplate("""
+APP_NAVIGATION_QUARTER_FULL = """
 <ul>
-  <li><a href="{{annual}}">Annual</a></li>
+  <li><a href="{annual}">Annual</a></li>
   [
-      <li><a href="{{q1}}">Q1</a></li>
-      <li><a href="{{q2}}">Q2</a></li>
-      <li><a href="{{q3}}">Q3</a></li>
-      <li><a href="{{q4}}">Q4</a></li>
+      <li><a href="{q1}">Q1</a></li>
+      <li><a href="{q2}">Q2</a></li>
+      <li><a href="{q3}">Q3</a></li>
+      <li><a href="{q4}">Q4</a></li>
   ]
 </ul>
-""")
+"""
+
+# The quarter route as a format string; bottle's builder does not escape
+# its arguments, so formatting gives the same URL as router.build().
+_QUARTER_URL = web.app.router.build('quarter',
+                                    year='{year}',
+                                    quarter='{quarter}',
+                                    path='{path}')
+
+_ERRORS_OVERLAY = '<li><a href="{}">Errors</a></li>'.format(
+    web.app.router.build('errors'))
+
+
+def _escape(url):
+    """HTML-escape a URL for use in an href attribute."""
+    return html.escape(url, quote=True)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_app_navigation(view_title, script_name):
+    """Render the main navigation of a view.
+
+    Args:
+      view_title: A string, the title of the view.
+      script_name: A string, the mount point of the view. It is not used
+        directly but the view links in web.V are built relative to it.
+    Returns:
+      An HTML string of the rendered navigation.
+    """
+    return web.APP_NAVIGATION.render(A=web.A, V=web.V, view_title=view_title)
 
 
 def _patched_render_view(*args, **kw):
@@ -75,35 +119,37 @@ def _patched_render_view(*args, **kw):
       An HTML string of the rendered template.
     """
     response.content_type = 'text/html'
+    view = request.view
+    has_year = hasattr(view, 'year')
+    view_path = request.path[1:]
+
     kw['A'] = web.A  # Application mapper
     kw['V'] = web.V  # View mapper
     kw['title'] = web.app.options['title']
-    kw['view_title'] = ' - ' + request.view.title
+    kw['view_title'] = ' - ' + view.title
 
     overlays = []
-    if request.params.pop('render_overlay', False):
-        overlays.append('<li><a href="{}">Errors</a></li>'.format(
-            web.app.router.build('errors')))
+    annual = None
+    if 'render_overlay' in request.params:
+        overlays.append(_ERRORS_OVERLAY)
 
     # Render navigation, with monthly navigation option.
     oss = io.StringIO()
-    oss.write(
-        web.APP_NAVIGATION.render(A=web.A,
-                                  V=web.V,
-                                  view_title=request.view.title))
-    if hasattr(request.view, 'year'):
+    oss.write(_render_app_navigation(view.title, request.script_name))
+    if has_year:
         overlays.append('<li><a href="{}">Quarterly</a></li>'.format(
-            web.app.router.build('quarter',
-                                 year=request.view.year,
-                                 quarter=1,
-                                 path=request.path[1:])))
-
-    if request.view.monthly is views.MonthNavigation.COMPACT:
-        overlays.append('<li><a href="{}">Monthly</a></li>'.format(web.M.Jan))
-    elif request.view.monthly is views.MonthNavigation.FULL:
+            _escape(
+                _QUARTER_URL.format(year=view.year,
+                                    quarter=1,
+                                    path=view_path))))
+
+    if view.monthly is views.MonthNavigation.COMPACT:
+        overlays.append('<li><a href="{}">Monthly</a></li>'.format(
+            _escape(web.M.Jan)))
+    elif view.monthly is views.MonthNavigation.FULL:
         annual = web.app.router.build('year',
                                       path=web.DEFAULT_VIEW_REDIRECT,
-                                      year=request.view.year)
+                                      year=view.year)
         oss.write(
             web.APP_NAVIGATION_MONTHLY_FULL.render(M=web.M,
                                                    Mp=web.Mp,
@@ -111,19 +157,21 @@ def _patched_render_view(*args, **kw):
                                                    V=web.V,
                                                    annual=annual))
 
-    if hasattr(request.view, 'year') and hasattr(request.view, 'quarter'):
-        annual = web.app.router.build('year',
-                                      path=web.DEFAULT_VIEW_REDIRECT,
-                                      year=request.view.year)
+    if has_year and hasattr(view, 'quarter'):
+        if annual is None:
+            annual = web.app.router.build('year',
+                                          path=web.DEFAULT_VIEW_REDIRECT,
+                                          year=view.year)
+        quarter_url = functools.partial(_QUARTER_URL.format,
+                                        year=view.year,
+                                        path=view_path)
         oss.write(
-            APP_NAVIGATION_QUARTER_FULL.render(
-                annual=annual,
-                **dict([(f'q{i}',
-                         web.app.router.build('quarter',
-                                              year=request.view.year,
-                                              quarter=i,
-                                              path=request.path[1:]))
-                        for i in range(1, 5)])))
+            APP_NAVIGATION_QUARTER_FULL.format(
+                annual=_escape(annual),
+                q1=_escape(quarter_url(quarter=1)),
+                q2=_escape(quarter_url(quarter=2)),
+                q3=_escape(quarter_url(quarter=3)),
+                q4=_escape(quarter_url(quarter=4))))
 
     kw['navigation'] = oss.getvalue()
     kw['overlay'] = web.render_overlay(' '.join(overlays))
@@ -15,7 +15,7 @@ class DocumentError(typing.NamedTuple):
     entry: typing.NamedTuple
 
 
-def _basepath_from_config(options_map: typing.Mapping = {},
+def _basepath_from_config(options_map: typing.Mapping | None = None,
                           config=None) -> os.PathLike:
     return utils.basepath_from_config(
         'documents',
@@ -2,16 +2,21 @@ from os import path
 import os
 import typing
 
+_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+
 
 def basepath_from_config(default,
-                         options_map: typing.Mapping = {},
+                         options_map: typing.Mapping | None = None,
                          config: str = None) -> os.PathLike:
     docpath = default if config is None else config
 
-    if path.isabs(docpath):
+    # Absolute paths are the common case for configured directories, check
+    # the leading separator before asking os.path (needed for drive letters).
+    if docpath[:1] in _SEPARATORS or path.isabs(docpath):
         return docpath
 
-    main_file = options_map.get('filename', '<empty>')
+    main_file = '<empty>' if options_map is None else options_map.get(
+        'filename', '<empty>')
     if path.isfile(main_file):
         return path.join(path.dirname(main_file), docpath)
 
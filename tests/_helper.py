@@ -2,10 +2,8 @@ import os
 from os import path
 import typing
 
+_FIXTURES_DIR = path.join(path.dirname(__file__), 'fixtures')
+
 
 def fixture_path(*target: typing.List[str]) -> os.PathLike:
-    return path.join(
-        path.dirname(__file__),
-        'fixtures',
-        *target,
-    )
+    return path.join(_FIXTURES_DIR, *target)
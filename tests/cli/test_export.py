@@ -1,186 +1,226 @@
 from os import path
+import contextlib
+import datetime
+import io
+import tempfile
 import unittest
 
 from beancount import loader
 from beancount.parser import cmptest
 from beancount_toolbox.cli import export
-from beancount.core import data
-from beancount.utils import test_utils
+from beancount.core import amount, data, position
+from beancount.core.number import D
+
+
+_FIXTURES_DIR = path.join(
+    path.dirname(path.dirname(__file__)),
+    'fixtures',
+    'export',
+)
 
 
 def fixture_path() -> str:
-    return path.join(
-        path.dirname(path.dirname(__file__)),
-        'fixtures',
-        'export',
-    )
+    return _FIXTURES_DIR
+
+
+# Ledgers shared by tests which do not need a ledger of their own.
+_LEDGER = r"""
+    2011-01-01 * "Something"
+        Assets:Cash:Foobar  -1.00 USD
+        Expenses:Misc        1.00 USD
+
+    2011-01-02 * "Something else"
+        Assets:Cash:Baz     -1.00 USD
+        Expenses:Misc        1.00 USD
+    """
+
+_LEDGER_WITH_OPENS = r"""
+    2011-01-01 open Assets:Cash:Foobar
+    2011-01-02 open Assets:Cash:Baz
+    2011-01-01 open Expenses:Misc
+    """ + _LEDGER
+
+
+def _parse(ledger: str, expect_errors: bool):
+    """Parse a shared ledger and check its errors like loader.load_doc()."""
+    entries, errors, options_map = loader.load_string(ledger, dedent=True)
+    assert bool(errors) == expect_errors, errors
+    return tuple(entries), errors, options_map
+
+
+def _posting(account: str,
+             units: str,
+             cost: position.Cost = None,
+             price: str = None) -> data.Posting:
+    return data.Posting(account, amount.A(units), cost,
+                        None if price is None else amount.A(price), None, {})
+
+
+def _transaction(date: datetime.date,
+                 narration: str,
+                 *postings: data.Posting,
+                 tags: frozenset = data.EMPTY_SET) -> data.Transaction:
+    return data.Transaction(data.new_metadata('<test>', 0), date, '*', None,
+                            narration, tags, data.EMPTY_SET, list(postings))
+
+
+# _LEDGER lacks open directives and thus fails validation on purpose.
+_LEDGER_ENTRIES, _, _ = _parse(_LEDGER, True)
+_LEDGER_WITH_OPENS_ENTRIES, _, _LEDGER_WITH_OPENS_OPTIONS_MAP = _parse(
+    _LEDGER_WITH_OPENS, False)
+
+# Expected ledgers shared by several tests, parsed once per test run.
+_EXPECTED_BASIC = cmptest.read_string_or_entries(r"""
+    2011-01-01 open Assets:Cash:Foobar
+    2011-01-02 open Assets:Cash:Baz
+    2011-01-01 open Expenses:Misc
+
+    2011-01-01 * "Something"
+        Assets:Cash:Foobar  -1.00 USD
+        Expenses:Misc        1.00 USD
+
+    2011-01-02 * "Something else"
+        Assets:Cash:Baz     -1.00 USD
+        Expenses:Misc        1.00 USD
+    """)
+
+_EXPECTED_SPLIT_EXPENSES = cmptest.read_string_or_entries(r"""
+    2011-01-01 open Assets:Cash:Foobar
+    2011-01-02 open Assets:Cash:Baz
+    2011-01-01 open Expenses:Misc
+    2011-01-01 open Expenses:Misc:A
+    2011-01-01 open Expenses:Misc:B
+
+    2011-01-01 * "Something"
+        Assets:Cash:Foobar  -1.00 USD
+        Expenses:Misc:A      0.50 USD
+        Expenses:Misc:B      0.50 USD
+
+    2011-01-02 * "Something else"
+        Assets:Cash:Baz     -1.00 USD
+        Expenses:Misc:A      0.50 USD
+        Expenses:Misc:B      0.50 USD
+    """)
+
+_EXPECTED_TRANSACTIONS_ONLY = cmptest.read_string_or_entries(r"""
+    2011-01-01 * "Something" #foo
+        Assets:Cash:Foobar  -1.00 USD
+        Expenses:Misc        1.00 USD
+
+    2011-01-02 * "Something else"
+        Assets:Cash:Baz     -1.00 USD
+        Expenses:Misc        1.00 USD
+    """)
+
+_EXPECTED_RENAMED_ACCOUNT = cmptest.read_string_or_entries(r"""
+    2011-01-01 * "Something"
+        Assets:Cash:Foobar  -1.00 USD
+        Expenses:Foobar      1.00 USD
+
+    2011-01-02 * "Something else"
+        Assets:Cash:Baz     -1.00 USD
+        Expenses:Foobar      1.00 USD
+    """)
+
+_EXPECTED_RENAMED_COMMODITY = cmptest.read_string_or_entries(r"""
+    2011-01-01 * "Something"
+        Assets:Cash:Foobar  -1.00 EUR
+        Expenses:Misc        1.00 EUR
+
+    2011-01-02 * "Something else"
+        Assets:Cash:Baz     -1.00 EUR
+        Expenses:Misc        1.00 EUR
+    """)
 
 
 class BeancountPluginConfig(cmptest.TestCase):
 
-    @loader.load_doc(expect_errors=True)
-    def test_beancount_auto_accounts(self, entires, errors, options_map):
-        """
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
+    entries = _LEDGER_WITH_OPENS_ENTRIES
+    options_map = _LEDGER_WITH_OPENS_OPTIONS_MAP
+    entries_without_opens = _LEDGER_ENTRIES
 
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
-        plugin = export.BeancountPluginConfig(
+    @classmethod
+    def setUpClass(cls):
+        cls.auto_accounts_plugin = export.BeancountPluginConfig(
             module_name='beancount.plugins.auto_accounts')
+        cls.split_expenses_plugin = export.BeancountPluginConfig(
+            module_name='beancount.plugins.split_expenses',
+            string_config='A B',
+        )
 
-        new_entries, new_errors = plugin.apply(entires, options_map)
+    def test_beancount_auto_accounts(self):
+        new_entries, new_errors = self.auto_accounts_plugin.apply(
+            list(self.entries_without_opens), self.options_map)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 open Assets:Cash:Foobar
-            2011-01-02 open Assets:Cash:Baz
-            2011-01-01 open Expenses:Misc
-
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc        1.00 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc        1.00 USD
-            """,
+            _EXPECTED_BASIC,
             new_entries,
         )
 
-    @loader.load_doc(expect_errors=False)
-    def test_beancount_split_expenses(self, entires, errors, options_map):
-        """
-        2011-01-01 open Assets:Cash:Foobar
-        2011-01-02 open Assets:Cash:Baz
-        2011-01-01 open Expenses:Misc
-
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
+    def test_beancount_split_expenses(self):
+        new_entries, new_errors = self.split_expenses_plugin.apply(
+            list(self.entries), self.options_map)
 
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
-        plugin = export.BeancountPluginConfig(
-            module_name='beancount.plugins.split_expenses',
-            string_config='A B',
+        self.assertEqual(0, len(new_errors))
+        self.assertEqualEntries(
+            _EXPECTED_SPLIT_EXPENSES,
+            new_entries,
         )
 
-        new_entries, new_errors = plugin.apply(entires, options_map)
+    def test_copied_config(self):
+        plugin = self.auto_accounts_plugin.model_copy(
+            update=dict(module_name='beancount.plugins.split_expenses',
+                        string_config='A B'))
+        new_entries, new_errors = plugin.apply(list(self.entries),
+                                               self.options_map)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 open Assets:Cash:Foobar
-            2011-01-02 open Assets:Cash:Baz
-            2011-01-01 open Expenses:Misc
-            2011-01-01 open Expenses:Misc:A
-            2011-01-01 open Expenses:Misc:B
-
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc:A      0.50 USD
-                Expenses:Misc:B      0.50 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc:A      0.50 USD
-                Expenses:Misc:B      0.50 USD
-            """,
+            _EXPECTED_SPLIT_EXPENSES,
             new_entries,
         )
 
 
 class TransactionOnlyConfig(cmptest.TestCase):
 
-    @loader.load_doc(expect_errors=False)
-    def test_empty_plugin_list(self, entires, errors, options_map):
-        """
-        2011-01-01 open Assets:Cash:Foobar
-        2011-01-02 open Assets:Cash:Baz
-        2011-01-01 open Expenses:Misc
+    entries = _LEDGER_WITH_OPENS_ENTRIES
+    options_map = _LEDGER_WITH_OPENS_OPTIONS_MAP
 
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
+    @classmethod
+    def setUpClass(cls):
+        cls.split_expenses_plugin = export.BeancountPluginConfig(
+            module_name='beancount.plugins.split_expenses',
+            string_config='A B',
+        )
+        cls.filter_tags_plugin = export.BeancountPluginConfig(
+            module_name='beancount_toolbox.plugins.filter_tags',
+            string_config='foo',
+        )
 
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_empty_plugin_list(self):
         plugin = export.TransactionOnlyConfig(keep_directives=True)
-        new_entries, new_errors = plugin.apply(entires, options_map)
+        new_entries, new_errors = plugin.apply(list(self.entries),
+                                               self.options_map)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 open Assets:Cash:Foobar
-            2011-01-02 open Assets:Cash:Baz
-            2011-01-01 open Expenses:Misc
-
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc        1.00 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc        1.00 USD
-            """,
+            _EXPECTED_BASIC,
             new_entries,
         )
 
-    @loader.load_doc(expect_errors=False)
-    def test_beancount_split_expenses(self, entires, errors, options_map):
-        """
-        2011-01-01 open Assets:Cash:Foobar
-        2011-01-02 open Assets:Cash:Baz
-        2011-01-01 open Expenses:Misc
-
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
-
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_beancount_split_expenses(self):
         plugin = export.TransactionOnlyConfig(
-            plugins=[
-                export.BeancountPluginConfig(
-                    module_name='beancount.plugins.split_expenses',
-                    string_config='A B',
-                )
-            ],
+            plugins=[self.split_expenses_plugin],
             keep_directives=True,
         )
 
-        new_entries, new_errors = plugin.apply(entires, options_map)
+        new_entries, new_errors = plugin.apply(list(self.entries),
+                                               self.options_map)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 open Assets:Cash:Foobar
-            2011-01-02 open Assets:Cash:Baz
-            2011-01-01 open Expenses:Misc
-            2011-01-01 open Expenses:Misc:A
-            2011-01-01 open Expenses:Misc:B
-
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc:A      0.50 USD
-                Expenses:Misc:B      0.50 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc:A      0.50 USD
-                Expenses:Misc:B      0.50 USD
-            """,
+            _EXPECTED_SPLIT_EXPENSES,
             new_entries,
         )
 
@@ -200,12 +240,7 @@ class TransactionOnlyConfig(cmptest.TestCase):
             Expenses:Misc        1.00 USD
         """
         plugin = export.TransactionOnlyConfig(
-            plugins=[
-                export.BeancountPluginConfig(
-                    module_name='beancount_toolbox.plugins.filter_tags',
-                    string_config='foo',
-                ),
-            ],
+            plugins=[self.filter_tags_plugin],
             keep_directives=True,
         )
 
@@ -249,34 +284,11 @@ class TransactionOnlyConfig(cmptest.TestCase):
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 * "Something" #foo
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc        1.00 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc        1.00 USD
-            """,
+            _EXPECTED_TRANSACTIONS_ONLY,
             new_entries,
         )
 
-    @loader.load_doc(expect_errors=False)
-    def test_inner_plugin_transaction_only_check(self, entires, errors,
-                                                 options_map):
-        """
-        2011-01-01 open Assets:Cash:Foobar
-        2011-01-02 open Assets:Cash:Baz
-        2011-01-01 open Expenses:Misc
-
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
-
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_inner_plugin_transaction_only_check(self):
 
         def check(entries, _options_map):
             for e in entries:
@@ -288,44 +300,86 @@ class TransactionOnlyConfig(cmptest.TestCase):
             keep_directives=True,
         )
 
-        plugin.apply(entires, options_map)
+        plugin.apply(list(self.entries), self.options_map)
 
 
 class TestExport(cmptest.TestCase):
 
-    def test_empty_config(self):
-        with test_utils.capture() as stdout:
-            test_utils.run_with_args(export.main, [
+    @classmethod
+    def setUpClass(cls):
+        fixtures = {}
+        for name in ('export1.yaml', 'export2.yaml', 'example.bean'):
+            with open(path.join(fixture_path(), name)) as f:
+                fixtures[name] = f.read()
+        cls.fixtures = fixtures
+        # An empty export definition reproduces the example ledger.
+        cls.example_entries = cmptest.read_string_or_entries(
+            fixtures['example.bean'])
+
+    def test_main(self):
+        stdout = io.StringIO()
+        export.main(
+            [
                 path.join(fixture_path(), 'export1.yaml'),
                 path.join(fixture_path(), 'example.bean'),
-            ])
-        output = stdout.getvalue()
+            ],
+            file=stdout,
+        )
 
         self.assertEqualEntries(
-            r"""
-            2011-01-01 open Assets:Cash:Foobar
-            2011-01-02 open Assets:Cash:Baz
-            2011-01-01 open Expenses:Misc
+            self.example_entries,
+            stdout.getvalue(),
+        )
 
-            2011-01-01 * "Something" #foobar
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc        1.00 USD
+    def test_main_file_overrides_output(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = path.join(tmpdir, 'output.bean')
+            export.main(
+                [
+                    '--output',
+                    output,
+                    path.join(fixture_path(), 'export1.yaml'),
+                    path.join(fixture_path(), 'example.bean'),
+                ],
+                file=io.StringIO(),
+            )
+
+            self.assertFalse(path.exists(output))
 
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc        1.00 USD
-            """,
+    def test_empty_config(self):
+        stdout = io.StringIO()
+        exit_code = export.run(
+            self.fixtures['export1.yaml'],
+            self.fixtures['example.bean'],
+            stdout,
+        )
+        output = stdout.getvalue()
+
+        self.assertEqual(0, exit_code)
+        self.assertEqualEntries(
+            self.example_entries,
             output,
         )
 
+    def test_invalid_config(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            exit_code = export.run('', self.fixtures['example.bean'], stdout)
+
+        self.assertEqual(2, exit_code)
+        self.assertEqual('', stdout.getvalue())
+        self.assertEqual('config file is invalid\n', stderr.getvalue())
+
     def test_tag_filter(self):
-        with test_utils.capture() as stdout:
-            test_utils.run_with_args(export.main, [
-                path.join(fixture_path(), 'export2.yaml'),
-                path.join(fixture_path(), 'example.bean'),
-            ])
+        stdout = io.StringIO()
+        exit_code = export.run(
+            self.fixtures['export2.yaml'],
+            self.fixtures['example.bean'],
+            stdout,
+        )
         output = stdout.getvalue()
 
+        self.assertEqual(0, exit_code)
         self.assertEqualEntries(
             r"""
             2011-01-01 * "Something" #foobar
@@ -358,15 +412,7 @@ class Action(cmptest.TestCase):
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 * "Something" #foo
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Misc        1.00 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Misc        1.00 USD
-            """,
+            _EXPECTED_TRANSACTIONS_ONLY,
             new_entries,
         )
 
@@ -392,30 +438,45 @@ class Action(cmptest.TestCase):
             new_entries,
         )
 
-    @loader.load_doc(expect_errors=True)
-    def test_apply_tidy_transactions(self, entires, errors, options_map):
-        """
-        2011-01-01 * "Something" #foo
-            Assets:Cash:Foobar  -1.00 USD
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
-
-        2011-01-02 * "Something II" #foo
-            Assets:Cash:Foobar  -2.00 USD @ 1 EUR
-            Assets:Cash:Foobar  -1.00 USD @ 1 EUR
-            Expenses:Misc        1.00 USD
+    def test_apply_tidy_transactions(self):
+        item_cost = position.Cost(D('1.50'), 'USD', datetime.date(2011, 1, 3),
+                                  None)
+        entires = [
+            _transaction(
+                datetime.date(2011, 1, 1),
+                'Something',
+                _posting('Assets:Cash:Foobar', '-1.00 USD'),
+                _posting('Assets:Cash:Foobar', '-1.00 USD'),
+                _posting('Expenses:Misc', '1.00 USD'),
+                tags=frozenset({'foo'}),
+            ),
+            _transaction(
+                datetime.date(2011, 1, 2),
+                'Something II',
+                _posting('Assets:Cash:Foobar', '-2.00 USD', price='1 EUR'),
+                _posting('Assets:Cash:Foobar', '-1.00 USD', price='1 EUR'),
+                _posting('Expenses:Misc', '1.00 USD'),
+                tags=frozenset({'foo'}),
+            ),
+            _transaction(
+                datetime.date(2011, 1, 3),
+                'Something III',
+                _posting('Assets:Cash:Foobar', '-2 ITEM', cost=item_cost),
+                _posting('Assets:Cash:Foobar', '-1 ITEM', cost=item_cost),
+                _posting('Expenses:Misc', '1.00 USD'),
+                tags=frozenset({'foo'}),
+            ),
+            _transaction(
+                datetime.date(2011, 1, 3),
+                'Something III',
+                _posting('Assets:Cash:Foobar', '-2 ITEM', cost=item_cost),
+                _posting('Assets:Cash:Foobar', '2 ITEM', cost=item_cost),
+                _posting('Assets:Cash:Foobar', '-1.00 USD'),
+                _posting('Expenses:Misc', '1.00 USD'),
+                tags=frozenset({'foo'}),
+            ),
+        ]
 
-        2011-01-03 * "Something III" #foo
-            Assets:Cash:Foobar  -2 ITEM {1.50 USD}
-            Assets:Cash:Foobar  -1 ITEM {1.50 USD}
-            Expenses:Misc        1.00 USD
-
-        2011-01-03 * "Something III" #foo
-            Assets:Cash:Foobar  -2 ITEM {1.50 USD}
-            Assets:Cash:Foobar   2 ITEM {1.50 USD}
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
         new_entries, new_errors = export.Action(
             keep_only_transactions=True)._apply_tidy_transactions(entires)
 
@@ -444,63 +505,44 @@ class Action(cmptest.TestCase):
 
 class RenameAccount(cmptest.TestCase):
 
-    @loader.load_doc(expect_errors=True)
-    def test_simple_replace(self, entires, errors, options_map):
-        """
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
+    entries = _LEDGER_ENTRIES
 
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_simple_replace(self):
         new_entries, new_errors = export.RenameAccount(
             old='Expenses:Misc',
             new='Expenses:Foobar',
-        )._apply(entires)
+        )._apply(self.entries)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Foobar      1.00 USD
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Foobar      1.00 USD
-            """,
+            _EXPECTED_RENAMED_ACCOUNT,
             new_entries,
         )
 
-    @loader.load_doc(expect_errors=True)
-    def test_regex_replace(self, entires, errors, options_map):
-        """
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
-
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_regex_replace(self):
         new_entries, new_errors = export.RenameAccount(
             old=r'^Exp.+sc$',
             new='Expenses:Foobar',
-        )._apply(entires)
+        )._apply(self.entries)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 USD
-                Expenses:Foobar      1.00 USD
+            _EXPECTED_RENAMED_ACCOUNT,
+            new_entries,
+        )
 
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 USD
-                Expenses:Foobar      1.00 USD
-            """,
+    def test_changed_pattern(self):
+        rename = export.RenameAccount(
+            old='Expenses:Food',
+            new='Expenses:Foobar',
+        )
+        rename._apply(self.entries)
+        rename = rename.model_copy(update=dict(old='Expenses:Misc'))
+        new_entries, new_errors = rename._apply(self.entries)
+
+        self.assertEqual(0, len(new_errors))
+        self.assertEqualEntries(
+            _EXPECTED_RENAMED_ACCOUNT,
             new_entries,
         )
 
@@ -537,33 +579,17 @@ class RenameAccount(cmptest.TestCase):
 
 class RenameCommodity(cmptest.TestCase):
 
-    @loader.load_doc(expect_errors=True)
-    def test_simple_replace(self, entires, errors, options_map):
-        """
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
+    entries = _LEDGER_ENTRIES
 
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_simple_replace(self):
         new_entries, new_errors = export.RenameCommodity(
             old='USD',
             new='EUR',
-        )._apply(entires)
+        )._apply(self.entries)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 EUR
-                Expenses:Misc        1.00 EUR
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 EUR
-                Expenses:Misc        1.00 EUR
-            """,
+            _EXPECTED_RENAMED_COMMODITY,
             new_entries,
         )
 
@@ -665,33 +691,15 @@ class RenameCommodity(cmptest.TestCase):
             new_entries,
         )
 
-    @loader.load_doc(expect_errors=True)
-    def test_regex_replace(self, entires, errors, options_map):
-        """
-        2011-01-01 * "Something"
-            Assets:Cash:Foobar  -1.00 USD
-            Expenses:Misc        1.00 USD
-
-        2011-01-02 * "Something else"
-            Assets:Cash:Baz     -1.00 USD
-            Expenses:Misc        1.00 USD
-        """
+    def test_regex_replace(self):
         new_entries, new_errors = export.RenameCommodity(
             old=r'^U.+D$',
             new='EUR',
-        )._apply(entires)
+        )._apply(self.entries)
 
         self.assertEqual(0, len(new_errors))
         self.assertEqualEntries(
-            r"""
-            2011-01-01 * "Something"
-                Assets:Cash:Foobar  -1.00 EUR
-                Expenses:Misc        1.00 EUR
-
-            2011-01-02 * "Something else"
-                Assets:Cash:Baz     -1.00 EUR
-                Expenses:Misc        1.00 EUR
-            """,
+            _EXPECTED_RENAMED_COMMODITY,
             new_entries,
         )
 
@@ -0,0 +1,79 @@
+import argparse
+import io
+from os import path
+import unittest
+
+from beancount.core import account
+from beancount_toolbox.cli import web
+from tests import _helper
+
+
+def _get(url_path: str) -> tuple[str, str]:
+    """Request a page from the web app through WSGI.
+
+    Args:
+      url_path: The path of the requested page.
+    Returns:
+      The status line and the decoded body of the response.
+    """
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url_path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+    }
+    status = []
+
+    def start_response(s, _headers, _exc_info=None):
+        status.append(s)
+
+    body = b''.join(web.web.app(environ, start_response))
+    return status[0], body.decode()
+
+
+class TestQuarterView(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        web.web.app.args = argparse.Namespace(
+            filename=_helper.fixture_path('export', 'example.bean'),
+            first_month=1,
+            no_source=False,
+            incognito=False,
+            view=None,
+        )
+        web.web.app.options = None
+        web.web.app.account_xform = account.AccountTransformer(None)
+        with open(path.join(path.dirname(web.web.__file__),
+                            'web.html')) as f:
+            web.web.template = web.web.bottle.SimpleTemplate(f)
+
+    def test_quarter_navigation(self):
+        status, body = _get('/x/view/year/2011/quarter/2/balsheet')
+
+        self.assertEqual('200 OK', status)
+        for quarter in range(1, 5):
+            self.assertIn(
+                f'<a href="/x/view/year/2011/quarter/{quarter}/balsheet">'
+                f'Q{quarter}</a>', body)
+
+    def test_quarter_out_of_range(self):
+        for quarter in (0, 5, 9):
+            status, _ = _get(f'/x/view/year/2011/quarter/{quarter}/balsheet')
+            self.assertEqual('404 Not Found', status)
+
+    def test_quarter_navigation_escapes_path(self):
+        status, body = _get(
+            '/x/view/year/2011/quarter/1/journal/"><script>alert(1)</script>')
+
+        self.assertEqual('200 OK', status)
+        self.assertNotIn('<script>alert(1)</script>', body)
+        for quarter in range(1, 5):
+            self.assertIn(
+                f'<a href="/x/view/year/2011/quarter/{quarter}/journal/'
+                '&quot;&gt;&lt;script&gt;alert(1)&lt;/script&gt;">'
+                f'Q{quarter}</a>', body)
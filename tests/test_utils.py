@@ -4,12 +4,15 @@ import unittest
 from beancount_toolbox import utils
 
 
+_FIXTURES_DIR = path.join(
+    path.dirname(__file__),
+    'fixtures',
+    'documents',
+)
+
+
 def fixture_path() -> str:
-    return path.join(
-        path.dirname(__file__),
-        'fixtures',
-        'documents',
-    )
+    return _FIXTURES_DIR
 
 
 class TestBasePathFromConfig(unittest.TestCase):